@@ -1 +1,11 @@
-python3 src/main.py
+# With BUILD_SOCKET pointing at a running `python3 src/main.py --serve`
+# daemon, builds are handed to it instead of starting a cold interpreter.
+# Exit status 75 means no daemon answered, so build locally instead.
+if [ -n "$BUILD_SOCKET" ]; then
+    python3 src/main.py --connect "$BUILD_SOCKET" "$@"
+    status=$?
+    if [ "$status" -ne 75 ]; then
+        exit "$status"
+    fi
+fi
+python3 src/main.py "$@"
@@ -0,0 +1,365 @@
+import gc
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+from htmlnode import ParentNode, RenderContext, text_node_to_leaf
+from inline import extract_markdown_images, text_to_textnodes
+from options import COMPRESSED_SUFFIXES, GC_MODES
+from shards import (
+    remove_partial_indexes,
+    shard_for,
+    write_index,
+    write_partial_index,
+)
+from textbatch import batch_index_entry, render_batch, texts_to_batch
+from textnode import TextType
+
+
+def markdown_to_paragraphs(markdown):
+    paragraphs = []
+    for block in markdown.split("\n\n"):
+        block = block.strip()
+        if block != "":
+            paragraphs.append(block)
+    return paragraphs
+
+
+def markdown_to_blocks(markdown):
+    return [text_to_textnodes(block) for block in markdown_to_paragraphs(markdown)]
+
+
+def blocks_to_html_node(blocks, image_props=None):
+    paragraphs = []
+    for nodes in blocks:
+        children = []
+        for node in nodes:
+            props = None
+            if image_props is not None and node.text_type == TextType.IMAGES:
+                props = image_props.get(node.url)
+            children.append(text_node_to_leaf(node, props))
+        paragraphs.append(ParentNode("p", children))
+
+    if len(paragraphs) == 0:
+        raise ValueError("Page must have at least one paragraph")
+    return ParentNode("div", paragraphs)
+
+
+def markdown_to_html_node(markdown, image_props=None):
+    return blocks_to_html_node(markdown_to_blocks(markdown), image_props)
+
+
+def index_entry(path, blocks):
+    links = []
+    texts = []
+    for nodes in blocks:
+        for node in nodes:
+            if node.text_type == TextType.LINKS:
+                links.append(node.url)
+        texts.append(
+            "".join(node.text for node in nodes if node.text_type != TextType.IMAGES)
+        )
+    return {"path": path, "links": links, "text": " ".join(texts)}
+
+
+def find_pages(content_dir):
+    pages = []
+    for root, dirs, files in os.walk(content_dir):
+        for name in files:
+            if name.endswith(".md"):
+                pages.append(os.path.relpath(os.path.join(root, name), content_dir))
+    return sorted(pages)
+
+
+def write_if_changed(path, data):
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    remove_compressed_siblings(path)
+    return True
+
+
+def remove_compressed_siblings(path):
+    for suffix in COMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+GC_BATCH_SIZE = 100
+GC_FROZEN_THRESHOLD = 50_000
+
+
+class GCMonitor:
+    def __init__(self):
+        self.collections = 0
+        self.time = 0.0
+        self._started = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.time += time.perf_counter() - self._started
+            self.collections += 1
+            self._started = None
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        gc.callbacks.remove(self)
+
+
+class GCMode:
+    # Rendered trees are acyclic and freed by reference counting, so the
+    # cyclic collector only needs to run occasionally during a build.
+    def __init__(self, mode):
+        if mode not in GC_MODES:
+            raise ValueError(f"Unknown gc mode: '{mode}'")
+        self.mode = mode
+
+    def __enter__(self):
+        self._enabled = gc.isenabled()
+        self._threshold = gc.get_threshold()
+        self._froze = False
+        if self.mode == "default":
+            return self
+
+        # gc.unfreeze() releases everything in the permanent generation, so
+        # only freeze when nothing is frozen yet: a caller that froze its
+        # own objects (a daemon after startup, say) keeps them frozen.
+        if gc.get_freeze_count() == 0:
+            gc.collect()
+            gc.freeze()
+            self._froze = True
+        if self.mode == "freeze":
+            gc.set_threshold(GC_FROZEN_THRESHOLD, *self._threshold[1:])
+        else:
+            gc.disable()
+        return self
+
+    def end_batch(self):
+        if self.mode == "batch":
+            gc.collect(0)
+
+    def __exit__(self, *exc_info):
+        if self.mode == "default":
+            return
+        gc.set_threshold(*self._threshold)
+        if self._froze:
+            gc.unfreeze()
+        if self._enabled:
+            gc.enable()
+
+
+def read_page(content_dir, page):
+    with open(os.path.join(content_dir, page), encoding="utf-8") as f:
+        return f.read()
+
+
+def collect_image_props(content_dir, pages, static_dir, cache_path=None):
+    from images import (
+        ImageSizeCache,
+        image_props,
+        image_sizes,
+        is_local_url,
+        resolve_image_path,
+    )
+
+    page_images = {}
+    for page in pages:
+        urls = {url for _, url in extract_markdown_images(read_page(content_dir, page))}
+        page_images[page] = {
+            url: resolve_image_path(url, page, static_dir)
+            for url in urls
+            if is_local_url(url)
+        }
+
+    cache = ImageSizeCache(cache_path)
+    paths = [path for images in page_images.values() for path in images.values()]
+    sizes = image_sizes(paths, cache)
+    cache.save()
+
+    props = {
+        page: {url: image_props(sizes[path]) for url, path in images.items()}
+        for page, images in page_images.items()
+    }
+    stats = {
+        "images": len(sizes),
+        "image_cache_hits": cache.hits,
+        "image_cache_misses": cache.misses,
+    }
+    return props, stats
+
+
+def build_site(
+    content_dir,
+    public_dir,
+    minify=False,
+    compress=False,
+    gc_mode="default",
+    static_dir=None,
+    image_cache=None,
+    shard=None,
+    base_url="",
+    context=None,
+    page_cache=None,
+):
+    if shard is not None and base_url:
+        raise ValueError("base_url is only used when merging sharded builds")
+    if context is None:
+        context = RenderContext()
+    props_hits, props_misses = context.props_hits, context.props_misses
+    if page_cache is not None:
+        page_hits, page_misses = page_cache.hits, page_cache.misses
+    stats = {"pages": 0, "written": 0, "unchanged": 0, "compressed": 0}
+    outputs = []
+    entries = []
+    started = time.perf_counter()
+    pages = find_pages(content_dir)
+    if shard is not None:
+        index, count = shard
+        pages = [page for page in pages if shard_for(page, count) == index]
+
+    page_image_props = {}
+    if static_dir is not None:
+        page_image_props, image_stats = collect_image_props(
+            content_dir, pages, static_dir, image_cache
+        )
+        stats.update(image_stats)
+
+    with GCMonitor() as monitor, GCMode(gc_mode) as collector:
+        plan = []
+        for page in pages:
+            markdown = read_page(content_dir, page)
+            image_props = page_image_props.get(page)
+            key = None
+            cached = None
+            if page_cache is not None:
+                key = page_cache.key(page, markdown, minify, image_props)
+                cached = page_cache.get(key)
+            plan.append((page, markdown, image_props, key, cached))
+
+        # Every page missing from the cache is parsed in one batch; rendered
+        # pages come back one at a time, in plan order.
+        rendered = render_pages(
+            [
+                (page, markdown, image_props)
+                for page, markdown, image_props, _, cached in plan
+                if cached is None
+            ],
+            minify,
+            context,
+        )
+        for page, markdown, image_props, key, cached in plan:
+            if cached is None:
+                cached = next(rendered)
+                if page_cache is not None:
+                    page_cache.set(key, cached)
+            html, entry = cached
+
+            output = os.path.join(public_dir, entry["path"])
+            if write_if_changed(output, html.encode("utf-8")):
+                stats["written"] += 1
+            else:
+                stats["unchanged"] += 1
+            stats["pages"] += 1
+            outputs.append(output)
+            entries.append(entry)
+            if stats["pages"] % GC_BATCH_SIZE == 0:
+                collector.end_batch()
+
+    if compress:
+        from minify import precompress
+
+        stats["compressed"] = len(precompress(outputs))
+
+    # A single-node build writes the index from its own entries. Partial
+    # indexes left in _index by an unfinished sharded build would otherwise
+    # be published with the site, so they are removed.
+    if shard is None:
+        entries.sort(key=lambda entry: entry["path"])
+        write_index(public_dir, entries, base_url)
+        stats["stale_partials"] = remove_partial_indexes(public_dir)
+    else:
+        write_partial_index(public_dir, *shard, entries)
+        stats["shard"] = f"{shard[0]}/{shard[1]}"
+
+    stats["props_cache_hits"] = context.props_hits - props_hits
+    stats["props_cache_misses"] = context.props_misses - props_misses
+    if page_cache is not None:
+        stats["page_cache_hits"] = page_cache.hits - page_hits
+        stats["page_cache_misses"] = page_cache.misses - page_misses
+    stats["gc_mode"] = gc_mode
+    stats["gc_collections"] = monitor.collections
+    stats["gc_time"] = round(monitor.time, 6)
+    stats["elapsed"] = round(time.perf_counter() - started, 6)
+    return stats
+
+
+def render_pages(pages, minify=False, context=None):
+    # pages is a list of (page, markdown, image_props). All their paragraphs
+    # go through the inline splitters as a single TextNodeBatch, and each
+    # page's HTML and index entry are read straight from its groups, so no
+    # TextNode or HTMLNode objects are created. Yields (html, entry) pairs.
+    if context is None:
+        context = RenderContext()
+    if minify:
+        # minify pulls in gzip and concurrent.futures, so plain builds
+        # never import it.
+        from minify import minify_html
+
+    paragraphs = []
+    groups = []
+    for page, markdown, image_props in pages:
+        first = len(paragraphs)
+        paragraphs.extend(markdown_to_paragraphs(markdown))
+        groups.append((first, len(paragraphs)))
+    batch = texts_to_batch(paragraphs)
+
+    for (page, markdown, image_props), (first, last) in zip(pages, groups):
+        html = render_batch(batch, first, last, image_props, context)
+        if minify:
+            html = minify_html(html)
+        path = os.path.splitext(page)[0].replace(os.sep, "/") + ".html"
+        yield html, batch_index_entry(path, batch, first, last)
+
+
+class PageCache:
+    # Rendered pages keyed by path, content hash and render options, kept
+    # in least-recently-used order so long-running builds stay bounded.
+    def __init__(self, max_pages=10_000):
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(page, markdown, minify, image_props):
+        digest = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+        return (page, digest, minify, repr(image_props))
+
+    def get(self, key):
+        cached = self.pages.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.pages.move_to_end(key)
+        return cached
+
+    def set(self, key, value):
+        self.pages[key] = value
+        self.pages.move_to_end(key)
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+
+    def __len__(self):
+        return len(self.pages)
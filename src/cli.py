@@ -0,0 +1,136 @@
+import argparse
+import os
+
+# Only the branch that is taken imports the rest: --connect never loads
+# the renderer, and --merge only needs shards.
+from options import GC_MODES, format_stats, parse_shard
+
+
+def _shard(value):
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static site")
+    parser.add_argument("--content", default="content")
+    parser.add_argument("--public", default="public")
+    parser.add_argument(
+        "--minify", action="store_true", help="collapse insignificant whitespace"
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="write precompressed siblings"
+    )
+    parser.add_argument(
+        "--gc",
+        choices=GC_MODES,
+        default="default",
+        help="how to manage the cyclic garbage collector while rendering",
+    )
+    parser.add_argument(
+        "--static",
+        help="directory of local images to read width/height from",
+    )
+    parser.add_argument("--image-cache", default=".cache/image-sizes.json")
+    parser.add_argument(
+        "--shard",
+        type=_shard,
+        metavar="i/N",
+        help="only build the pages assigned to shard i of N",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="merge the partial indexes written by sharded builds",
+    )
+    parser.add_argument("--base-url", default="", help="prefix for sitemap entries")
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="run a build daemon with warm caches on a Unix socket",
+    )
+    parser.add_argument(
+        "--connect",
+        metavar="SOCKET",
+        help="send this command to the build daemon on SOCKET",
+    )
+    parser.add_argument(
+        "--daemon-stats",
+        action="store_true",
+        help="print the connected daemon's cache statistics",
+    )
+    parser.add_argument(
+        "--shutdown", action="store_true", help="stop the connected daemon"
+    )
+    args = parser.parse_args(argv)
+    if args.shard is not None and args.base_url:
+        # The sitemap is written by --merge, so that is where it belongs.
+        parser.error("--base-url is used by --merge, not by --shard builds")
+
+    if args.serve:
+        from daemon import serve
+
+        try:
+            serve(args.serve)
+        except FileExistsError as e:
+            parser.error(str(e))
+        return
+
+    options = {
+        "content_dir": args.content,
+        "public_dir": args.public,
+        "minify": args.minify,
+        "compress": args.compress,
+        "gc_mode": args.gc,
+        "static_dir": args.static,
+        "image_cache": args.image_cache,
+        "shard": args.shard,
+        "base_url": args.base_url,
+    }
+
+    if args.connect:
+        from client import DAEMON_UNAVAILABLE, send_request
+
+        # The daemon runs in its own working directory.
+        for key in ("content_dir", "public_dir", "static_dir", "image_cache"):
+            if options[key] is not None:
+                options[key] = os.path.abspath(options[key])
+        if args.shutdown:
+            request = {"command": "shutdown"}
+        elif args.daemon_stats:
+            request = {"command": "stats"}
+        elif args.merge:
+            request = {"command": "merge", "options": options}
+        else:
+            request = {"command": "build", "options": options}
+
+        try:
+            print(format_stats(send_request(args.connect, request)))
+        except (ConnectionRefusedError, FileNotFoundError):
+            message = f"{parser.prog}: no build daemon on '{args.connect}'\n"
+            parser.exit(DAEMON_UNAVAILABLE, message)
+        except (OSError, RuntimeError) as e:
+            parser.error(str(e))
+        return
+
+    if args.daemon_stats or args.shutdown:
+        parser.error("--daemon-stats and --shutdown need --connect")
+
+    if args.merge:
+        from shards import merge_indexes
+
+        try:
+            print(f"pages: {merge_indexes(args.public, args.base_url)}")
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
+    from build import build_site
+
+    try:
+        stats = build_site(**options)
+    except ValueError as e:
+        parser.error(str(e))
+    print(format_stats(stats))
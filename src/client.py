@@ -0,0 +1,22 @@
+import json
+import socket
+
+# EX_TEMPFAIL from sysexits.h: nothing is listening on the socket, so
+# main.sh falls back to a local build.
+DAEMON_UNAVAILABLE = 75
+
+
+def send_request(socket_path, request, timeout=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+    if not line:
+        raise RuntimeError("Build daemon closed the connection without replying")
+    response = json.loads(line)
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["stats"]
@@ -0,0 +1,161 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import time
+
+from build import PageCache, build_site
+from htmlnode import RenderContext
+from options import BUILD_OPTIONS
+from shards import merge_indexes
+
+
+class BuildDaemon:
+    # Holds everything that is expensive to rebuild between runs: imported
+    # modules, compiled regexes, the render context and rendered pages.
+    def __init__(self, max_pages=10_000):
+        self.context = RenderContext()
+        self.page_cache = PageCache(max_pages)
+        self.started = time.monotonic()
+        self.builds = 0
+
+    def build(self, options):
+        unknown = set(options) - set(BUILD_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown build options: {sorted(unknown)}")
+        if options.get("shard") is not None:
+            options = dict(options, shard=tuple(options["shard"]))
+
+        stats = build_site(**options, context=self.context, page_cache=self.page_cache)
+        self.builds += 1
+        return stats
+
+    def stats(self):
+        return {
+            "builds": self.builds,
+            "uptime": round(time.monotonic() - self.started, 3),
+            "page_cache_size": len(self.page_cache),
+            "page_cache_hits": self.page_cache.hits,
+            "page_cache_misses": self.page_cache.misses,
+            "props_cache_hits": self.context.props_hits,
+            "props_cache_misses": self.context.props_misses,
+        }
+
+    def handle(self, request):
+        command = request.get("command")
+        if command == "build":
+            return {"ok": True, "stats": self.build(request.get("options", {}))}
+        elif command == "merge":
+            options = request.get("options", {})
+            pages = merge_indexes(options["public_dir"], options.get("base_url", ""))
+            return {"ok": True, "stats": {"pages": pages}}
+        elif command == "stats":
+            return {"ok": True, "stats": self.stats()}
+        else:
+            raise ValueError(f"Unknown command: '{command}'")
+
+
+# A client that connects but never finishes its request line would
+# otherwise hold the single-threaded server, and every later build, forever.
+REQUEST_TIMEOUT = 30
+
+
+def parse_request(line):
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    if not isinstance(request.get("options", {}), dict):
+        raise ValueError("Request options must be a JSON object")
+    return request
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+        except TimeoutError:
+            return
+        if not line:
+            # A client that connected without sending anything, such as
+            # another daemon checking whether this socket is live.
+            return
+        try:
+            request = parse_request(line)
+            if request.get("command") == "shutdown":
+                response = {"ok": True, "stats": self.server.daemon.stats()}
+                self.server.shutdown_requested = True
+            else:
+                response = self.server.daemon.handle(request)
+        except (KeyError, OSError, TypeError, ValueError) as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        try:
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        except OSError:
+            # The client gave up before the reply; nothing left to do.
+            return
+
+
+def remove_stale_socket(socket_path):
+    # Only a socket that nothing is listening on may be replaced: a regular
+    # file is never ours to delete, and a live socket is another daemon.
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"Not a socket, refusing to replace: '{socket_path}'")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.remove(socket_path)
+            return
+    raise FileExistsError(f"A build daemon is already listening on '{socket_path}'")
+
+
+class BuildServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time, so builds never race on the
+    # shared caches or the output directory.
+    def __init__(self, socket_path, daemon=None, request_timeout=REQUEST_TIMEOUT):
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        self.socket_path = socket_path
+        self.request_timeout = request_timeout
+        self.daemon = daemon if daemon is not None else BuildDaemon()
+        self.shutdown_requested = False
+        self.closed = False
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.server_close()
+        try:
+            os.remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def serve_until_shutdown(self):
+        try:
+            while not self.shutdown_requested:
+                self.handle_request()
+        finally:
+            self.close()
+
+
+def serve(socket_path):
+    # Turn SIGTERM and SIGINT into SystemExit before the socket is bound,
+    # so serve_until_shutdown always closes the server and unlinks it.
+    def stop(signum, frame):
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    BuildServer(socket_path).serve_until_shutdown()
@@ -0,0 +1,170 @@
+import os
+import random
+import time
+
+from htmlnode import ParentNode
+from inline import extract_markdown_images, extract_markdown_links
+from textnode import TextNode, TextType
+
+FUZZ_SEED = int(os.environ.get("FUZZ_SEED", "0"))
+FUZZ_ITERATIONS = int(os.environ.get("FUZZ_ITERATIONS", "300"))
+# Wall-clock checks are only meaningful on an otherwise idle machine, so
+# test.sh skips them and ./timing.sh runs them with FUZZ_TIMING=1.
+FUZZ_TIMING = os.environ.get("FUZZ_TIMING", "") == "1"
+
+# Generous enough for slow CI machines; a regex or split that backtracks
+# on the adversarial inputs below blows through it by orders of magnitude.
+TIME_BUDGET_BASE = 0.05
+TIME_BUDGET_PER_CHAR = 20e-6
+
+# Linear work grows by GROWTH_STEP when the input does, quadratic work by
+# GROWTH_STEP squared; anything past GROWTH_STEP * SUPERLINEAR_FACTOR fails.
+GROWTH_STEP = 8
+SUPERLINEAR_FACTOR = 2
+
+WORDS = ("word", "text", "a", "the", "my_page", "url", "x")
+FRAGMENTS = (
+    "**bold**",
+    "_italic_",
+    "`code`",
+    "`**not bold**`",
+    "[link](https://boot.dev)",
+    "[my_page](https://example.com/my_page)",
+    "![image](https://i.imgur.com/fJRm4Vk.jpeg)",
+    "![](empty.png)",
+    "[]()",
+)
+NOISE = ("*", "**", "_", "`", "[", "]", "(", ")", "!", "![", "](", "\n", "  ")
+
+
+def random_markdown(rng, length, noise=0.1):
+    parts = []
+    size = 0
+    while size < length:
+        roll = rng.random()
+        if roll < noise:
+            part = rng.choice(NOISE)
+        elif roll < 0.5:
+            part = rng.choice(FRAGMENTS)
+        else:
+            part = rng.choice(WORDS)
+        parts.append(part)
+        parts.append(" ")
+        size += len(part) + 1
+    return "".join(parts)
+
+
+def adversarial_inputs(n):
+    return {
+        "open_brackets": "[" * n,
+        "image_openers": "![" * n,
+        "unclosed_links": "[a](" * n,
+        "unclosed_images": "![a](" * n,
+        "bracket_pairs": "[]" * n,
+        "nested_brackets": "[" * n + "a" + "]" * n + "(" * n,
+        "many_links": "x [l](u) " * n,
+        "many_images": "x ![i](u) " * n,
+        "many_delimiters": "x **b** _i_ `c` " * n,
+        "long_word": "a" * n * 4,
+    }
+
+
+def run_outcome(func, *args):
+    try:
+        return ("ok", func(*args))
+    except ValueError as e:
+        return ("error", type(e))
+
+
+def best_time(func, *args, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def time_budget(size):
+    return TIME_BUDGET_BASE + TIME_BUDGET_PER_CHAR * size
+
+
+def growth_ratio(func, make_input, n):
+    # Floor the small timing so clock noise on tiny inputs cannot produce
+    # a huge ratio.
+    small = best_time(func, make_input(n))
+    large = best_time(func, make_input(n * GROWTH_STEP))
+    return large / max(small, 1e-5)
+
+
+def is_superlinear(ratio):
+    return ratio > GROWTH_STEP * SUPERLINEAR_FACTOR
+
+
+def new_rng(offset=0):
+    return random.Random(FUZZ_SEED + offset)
+
+
+# The original split-based implementations, kept as the reference that the
+# optimised functions in inline.py and htmlnode.py are diffed against.
+
+
+def reference_split_nodes_image(old_nodes):
+    new_nodes = []
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT:
+            new_nodes.append(old_node)
+            continue
+        original_text = old_node.text
+        images = extract_markdown_images(original_text)
+        if len(images) == 0:
+            new_nodes.append(old_node)
+            continue
+        for image in images:
+            sections = original_text.split(f"![{image[0]}]({image[1]})", 1)
+            if len(sections) != 2:
+                raise ValueError("invalid markdown, image section not closed")
+            if sections[0] != "":
+                new_nodes.append(TextNode(sections[0], TextType.TEXT))
+            new_nodes.append(TextNode(image[0], TextType.IMAGES, image[1]))
+            original_text = sections[1]
+        if original_text != "":
+            new_nodes.append(TextNode(original_text, TextType.TEXT))
+    return new_nodes
+
+
+def reference_split_nodes_link(old_nodes):
+    new_nodes = []
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT:
+            new_nodes.append(old_node)
+            continue
+        original_text = old_node.text
+        links = extract_markdown_links(original_text)
+        if len(links) == 0:
+            new_nodes.append(old_node)
+            continue
+        for link in links:
+            sections = original_text.split(f"[{link[0]}]({link[1]})", 1)
+            if len(sections) != 2:
+                raise ValueError("invalid markdown, link section not closed")
+            if sections[0] != "":
+                new_nodes.append(TextNode(sections[0], TextType.TEXT))
+            new_nodes.append(TextNode(link[0], TextType.LINKS, link[1]))
+            original_text = sections[1]
+        if original_text != "":
+            new_nodes.append(TextNode(original_text, TextType.TEXT))
+    return new_nodes
+
+
+def reference_to_html(node):
+    if not isinstance(node, ParentNode):
+        return node.to_html()
+    if node.tag is None:
+        raise ValueError("ParentNode must have a tag")
+    elif node.children is None or len(node.children) == 0:
+        raise ValueError("ParentNode must have children")
+    children_html = "".join(reference_to_html(child) for child in node.children)
+    return f"<{node.tag}{node.props_to_html()}>{children_html}</{node.tag}>"
@@ -1,6 +1,19 @@
+from io import StringIO
+
 from textnode import TextNode, TextType
 
 
+def props_to_html(props):
+    if props is None:
+        return ""
+
+    html_attrs = []
+    for key, value in props.items():
+        html_attrs.append(f'{key}="{value}"')
+
+    return " " + " ".join(html_attrs)
+
+
 class HTMLNode:
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
@@ -12,14 +25,7 @@ class HTMLNode:
         raise NotImplementedError
 
     def props_to_html(self):
-        if self.props is None:
-            return ""
-
-        html_attrs = []
-        for key, value in self.props.items():
-            html_attrs.append(f'{key}="{value}"')
-
-        return " " + " ".join(html_attrs)
+        return props_to_html(self.props)
 
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
@@ -45,35 +51,136 @@ class ParentNode(HTMLNode):
         super().__init__(tag, None, children, props)
 
     def to_html(self):
-        if self.tag is None:
-            raise ValueError("ParentNode must have a tag")
-        elif self.children is None or len(self.children) == 0:
-            raise ValueError("ParentNode must have children")
-
-        props_html = self.props_to_html()
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{props_html}>{children_html}</{self.tag}>"
-
-
-def text_node_to_html(text_node):
+        return RenderContext().render(self)
+
+
+_CACHED_PROP_TYPES = (str, int, bool)
+
+
+class RenderContext:
+    # Reused across pages: the output buffer keeps its capacity between
+    # renders, and attribute strings are built once per distinct props dict.
+    def __init__(self, max_cached_props=4096):
+        self.buffer = StringIO()
+        self.max_cached_props = max_cached_props
+        self.props_hits = 0
+        self.props_misses = 0
+        self._open_tags = {}
+        self._close_tags = {}
+
+    def open_tag(self, node):
+        # props_to_html can be overridden, so the class is part of the key.
+        return self._open_tag(type(node), node.tag, node.props, node)
+
+    def props_tag(self, tag, props):
+        # For tags written without a node, such as from a TextNodeBatch;
+        # they always render with the module-level props_to_html.
+        return self._open_tag(None, tag, props)
+
+    def _open_tag(self, kind, tag, props, node=None):
+        # An empty dict still renders a space after the tag, so None gets
+        # its own marker instead of sharing the key of no props items.
+        if props is None:
+            key = (kind, tag, None)
+        else:
+            key = [kind, tag]
+            for name, value in props.items():
+                # Equal values can render differently (True and 1, 1 and
+                # 1.0, 0.0 and -0.0), so only exact types whose equal values
+                # always print the same are cached, keyed with their type.
+                if type(name) is not str or type(value) not in _CACHED_PROP_TYPES:
+                    self.props_misses += 1
+                    return self._render_open_tag(tag, props, node)
+                key.append((name, type(value), value))
+            key = tuple(key)
+
+        open_tag = self._open_tags.get(key)
+        if open_tag is not None:
+            self.props_hits += 1
+            return open_tag
+
+        self.props_misses += 1
+        open_tag = self._render_open_tag(tag, props, node)
+        if len(self._open_tags) < self.max_cached_props:
+            self._open_tags[key] = open_tag
+        return open_tag
+
+    @staticmethod
+    def _render_open_tag(tag, props, node):
+        if node is not None:
+            return f"<{tag}{node.props_to_html()}>"
+        return f"<{tag}{props_to_html(props)}>"
+
+    def close_tag(self, tag):
+        close_tag = self._close_tags.get(tag)
+        if close_tag is None:
+            close_tag = self._close_tags[tag] = f"</{tag}>"
+        return close_tag
+
+    def write(self, node):
+        # Walk the tree with an explicit stack so deeply nested pages neither
+        # hit the recursion limit nor re-copy every subtree's HTML per level.
+        write = self.buffer.write
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                write(node)
+            elif isinstance(node, ParentNode):
+                if node.tag is None:
+                    raise ValueError("ParentNode must have a tag")
+                elif node.children is None or len(node.children) == 0:
+                    raise ValueError("ParentNode must have children")
+
+                write(self.open_tag(node))
+                stack.append(self.close_tag(node.tag))
+                stack.extend(reversed(node.children))
+            elif isinstance(node, LeafNode):
+                if node.value is None:
+                    raise ValueError
+                if node.tag is None:
+                    write(node.value)
+                else:
+                    write(self.open_tag(node))
+                    write(node.value)
+                    write(self.close_tag(node.tag))
+            else:
+                write(node.to_html())
+
+    def clear(self):
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+    def render(self, node):
+        self.clear()
+        self.write(node)
+        return self.buffer.getvalue()
+
+
+def text_node_to_leaf(text_node, image_props=None):
     if not isinstance((text_node), TextNode):
         raise Exception(
             "Must be one of the following: Text, Bold, Italic, Code, Links, or Images"
         )
 
     if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text).to_html()
+        return LeafNode(None, text_node.text)
     elif text_node.text_type == TextType.BOLD:
-        return LeafNode("strong", text_node.text).to_html()
+        return LeafNode("strong", text_node.text)
     elif text_node.text_type == TextType.ITALIC:
-        return LeafNode("em", text_node.text).to_html()
+        return LeafNode("em", text_node.text)
     elif text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text).to_html()
+        return LeafNode("code", text_node.text)
     elif text_node.text_type == TextType.LINKS:
-        return LeafNode("a", text_node.text, {"href": text_node.url}).to_html()
+        return LeafNode("a", text_node.text, {"href": text_node.url})
     elif text_node.text_type == TextType.IMAGES:
-        return LeafNode(
-            "img", "", {"src": text_node.url, "alt": text_node.text}
-        ).to_html()
+        props = {"src": text_node.url, "alt": text_node.text}
+        if image_props is not None:
+            props.update(image_props)
+        return LeafNode("img", "", props)
     else:
         raise Exception(f"Unknown text type: {text_node.text_type}")
+
+
+def text_node_to_html(text_node, image_props=None):
+    return text_node_to_leaf(text_node, image_props).to_html()
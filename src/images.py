@@ -0,0 +1,187 @@
+import json
+import os
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+HEADER_SIZE = 64
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _png_size(header):
+    if header[12:16] != b"IHDR":
+        raise ValueError("PNG is missing its IHDR chunk")
+    return struct.unpack(">II", header[16:24])
+
+
+def _gif_size(header):
+    return struct.unpack("<HH", header[6:10])
+
+
+def _webp_size(header):
+    chunk = header[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    elif chunk == b"VP8L":
+        bits = int.from_bytes(header[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    elif chunk == b"VP8X":
+        width = int.from_bytes(header[24:27], "little") + 1
+        height = int.from_bytes(header[27:30], "little") + 1
+        return width, height
+    else:
+        raise ValueError(f"Unknown WebP chunk: {chunk!r}")
+
+
+def _read_jpeg(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("JPEG has no start-of-frame segment")
+    return data
+
+
+def _jpeg_size(f):
+    # Walk the segment headers until a start-of-frame marker, seeking past
+    # segment bodies instead of reading them.
+    f.seek(2)
+    while True:
+        marker = _read_jpeg(f, 2)
+        if marker[0] != 0xFF:
+            raise ValueError("JPEG has no start-of-frame segment")
+        while marker[1] == 0xFF:
+            marker = marker[1:] + _read_jpeg(f, 1)
+        length = struct.unpack(">H", _read_jpeg(f, 2))[0]
+        if marker[1] in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">xHH", _read_jpeg(f, 5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+        if header.startswith(b"\x89PNG\r\n\x1a\n"):
+            width, height = _png_size(header)
+        elif header[:6] in (b"GIF87a", b"GIF89a"):
+            width, height = _gif_size(header)
+        elif header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            width, height = _webp_size(header)
+        elif header[:2] == b"\xff\xd8":
+            width, height = _jpeg_size(f)
+        else:
+            raise ValueError(f"Unsupported image format: {path}")
+    return width, height
+
+
+class ImageSizeCache:
+    # Entries are keyed by path and invalidated by size and mtime, so an
+    # unchanged image is never opened again.
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self.entries = self._load(path)
+
+    @staticmethod
+    def _load(path):
+        # The cache only saves work, so a missing, unreadable or corrupt
+        # file just means starting from empty.
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry, dict) and {"fingerprint", "size"} <= entry.keys()
+        }
+
+    @staticmethod
+    def _fingerprint(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def get(self, path):
+        entry = self.entries.get(path)
+        if entry is not None and entry["fingerprint"] == self._fingerprint(path):
+            self.hits += 1
+            return entry["size"]
+        self.misses += 1
+        return None
+
+    def set(self, path, size):
+        self.entries[path] = {"fingerprint": self._fingerprint(path), "size": size}
+
+    def save(self):
+        if self.path is None:
+            return
+        # Write beside the cache and rename over it, so an interrupted save
+        # never leaves a truncated file behind.
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+def _safe_image_size(path):
+    try:
+        return list(read_image_size(path))
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def image_sizes(paths, cache=None, max_workers=None):
+    if cache is None:
+        cache = ImageSizeCache()
+
+    sizes = {}
+    missing = []
+    for path in sorted(set(paths)):
+        if not os.path.isfile(path):
+            sizes[path] = None
+            continue
+        size = cache.get(path)
+        if size is None:
+            missing.append(path)
+        else:
+            sizes[path] = size
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for path, size in zip(missing, executor.map(_safe_image_size, missing)):
+                sizes[path] = size
+                if size is not None:
+                    cache.set(path, size)
+
+    return {path: None if size is None else tuple(size) for path, size in sizes.items()}
+
+
+def is_local_url(url):
+    return not (url.startswith("//") or url.startswith("data:") or "://" in url)
+
+
+def resolve_image_path(url, page, static_dir):
+    url = url.split("#", 1)[0].split("?", 1)[0]
+    if url.startswith("/"):
+        return os.path.join(static_dir, url.lstrip("/"))
+    return os.path.join(static_dir, os.path.dirname(page), url)
+
+
+def image_props(size):
+    props = {"loading": "lazy"}
+    if size is not None:
+        props["width"] = str(size[0])
+        props["height"] = str(size[1])
+    return props
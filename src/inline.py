@@ -1,8 +1,6 @@
 import re
-from typing import Text
 
-from htmlnode import *
-from textnode import *
+from textnode import TextNode, TextType
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -54,12 +52,16 @@ def split_nodes_image(old_nodes):
         if len(images) == 0:
             new_nodes.append(old_node)
             continue
+        cursor = 0
         for image in images:
-            sections = original_text.split(f"![{image[0]}]({image[1]})", 1)
-            if len(sections) != 2:
+            markup = f"![{image[0]}]({image[1]})"
+            position = original_text.find(markup, cursor)
+            if position == -1:
                 raise ValueError("invalid markdown, image section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
+            if position != cursor:
+                new_nodes.append(
+                    TextNode(original_text[cursor:position], TextType.TEXT)
+                )
             new_nodes.append(
                 TextNode(
                     image[0],
@@ -67,9 +69,9 @@ def split_nodes_image(old_nodes):
                     image[1],
                 )
             )
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
+            cursor = position + len(markup)
+        if cursor != len(original_text):
+            new_nodes.append(TextNode(original_text[cursor:], TextType.TEXT))
     return new_nodes
 
 
@@ -84,14 +86,28 @@ def split_nodes_link(old_nodes):
         if len(links) == 0:
             new_nodes.append(old_node)
             continue
+        cursor = 0
         for link in links:
-            sections = original_text.split(f"[{link[0]}]({link[1]})", 1)
-            if len(sections) != 2:
+            markup = f"[{link[0]}]({link[1]})"
+            position = original_text.find(markup, cursor)
+            if position == -1:
                 raise ValueError("invalid markdown, link section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
+            if position != cursor:
+                new_nodes.append(
+                    TextNode(original_text[cursor:position], TextType.TEXT)
+                )
             new_nodes.append(TextNode(link[0], TextType.LINKS, link[1]))
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
+            cursor = position + len(markup)
+        if cursor != len(original_text):
+            new_nodes.append(TextNode(original_text[cursor:], TextType.TEXT))
     return new_nodes
+
+
+def text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return nodes
@@ -1,10 +1,6 @@
-from textnode import *
-
-
-def main():
-    new_node = TextNode("Some Test Text", TextType.LINKS, "https://ianwatkins.dev")
-    print(new_node)
-
+# Kept minimal: the script itself is recompiled on every run, while the
+# modules it imports are loaded from cached bytecode.
+from cli import main
 
 if __name__ == "__main__":
     main()
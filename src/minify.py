@@ -0,0 +1,111 @@
+import gzip
+import os
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from options import COMPRESSED_SUFFIXES
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+PRESERVE_TAGS = ("pre", "code", "textarea", "script", "style")
+
+_TOKEN_RE = re.compile(r"<[^<>]*>")
+_TAG_NAME_RE = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)")
+# Only ASCII whitespace is insignificant in HTML; \s would also collapse
+# no-break and other Unicode spaces that change the rendered text.
+_WHITESPACE_RE = re.compile(r"[ \t\n\r\f]+")
+
+
+def minify_html(html):
+    out = []
+    preserve = 0
+    position = 0
+    for match in _TOKEN_RE.finditer(html):
+        text = html[position : match.start()]
+        if text:
+            out.append(text if preserve else _WHITESPACE_RE.sub(" ", text))
+
+        tag = match.group()
+        name = _TAG_NAME_RE.match(tag)
+        if name and name.group(2).lower() in PRESERVE_TAGS:
+            if name.group(1):
+                preserve = max(preserve - 1, 0)
+            else:
+                preserve += 1
+        out.append(tag)
+        position = match.end()
+
+    text = html[position:]
+    if text:
+        out.append(text if preserve else _WHITESPACE_RE.sub(" ", text))
+    return "".join(out)
+
+
+def compressed_suffixes():
+    return [
+        suffix
+        for suffix in COMPRESSED_SUFFIXES
+        if suffix != ".zst" or zstd is not None
+    ]
+
+
+def _compress(data, suffix):
+    if suffix == ".gz":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    elif suffix == ".zst":
+        return zstd.compress(data)
+    else:
+        raise ValueError(f"Unknown compression suffix: '{suffix}'")
+
+
+def _decompress(data, suffix):
+    if suffix == ".gz":
+        return gzip.decompress(data)
+    elif suffix == ".zst":
+        return zstd.decompress(data)
+    else:
+        raise ValueError(f"Unknown compression suffix: '{suffix}'")
+
+
+_DECOMPRESS_ERRORS = (EOFError, OSError, zlib.error)
+if zstd is not None:
+    _DECOMPRESS_ERRORS += (zstd.ZstdError,)
+
+
+def _is_stale(data, target, suffix):
+    # Compare contents rather than mtimes: a page rewritten within the
+    # filesystem's timestamp resolution would otherwise look up to date.
+    if not os.path.exists(target):
+        return True
+    with open(target, "rb") as f:
+        compressed = f.read()
+    try:
+        return _decompress(compressed, suffix) != data
+    except _DECOMPRESS_ERRORS:
+        return True
+
+
+def _precompress_file(path):
+    written = []
+    with open(path, "rb") as f:
+        data = f.read()
+    for suffix in compressed_suffixes():
+        target = path + suffix
+        if not _is_stale(data, target, suffix):
+            continue
+        with open(target, "wb") as f:
+            f.write(_compress(data, suffix))
+        written.append(target)
+    return written
+
+
+def precompress(paths, max_workers=None):
+    written = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for targets in executor.map(_precompress_file, paths):
+            written.extend(targets)
+    return written
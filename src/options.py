@@ -0,0 +1,34 @@
+# Shared by the CLI, the build and the daemon. Kept free of the rendering
+# modules so `--connect` and `--merge` start without importing them.
+
+GC_MODES = ("default", "freeze", "batch")
+
+# Every sibling suffix precompress can write. Builds remove them all when
+# a page changes, whether or not they compress.
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+BUILD_OPTIONS = (
+    "content_dir",
+    "public_dir",
+    "minify",
+    "compress",
+    "gc_mode",
+    "static_dir",
+    "image_cache",
+    "shard",
+    "base_url",
+)
+
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like 'i/N', got: '{value}'")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count}, got: {index}")
+    return index, count
+
+
+def format_stats(stats):
+    return "\n".join(f"{key}: {value}" for key, value in stats.items())
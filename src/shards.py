@@ -0,0 +1,105 @@
+import hashlib
+import heapq
+import json
+import os
+import re
+
+INDEX_DIR = "_index"
+_PARTIAL_RE = re.compile(r"shard-(\d+)-of-(\d+)\.json$")
+
+
+def page_key(page):
+    return page.replace(os.sep, "/")
+
+
+def shard_for(page, shard_count):
+    # Hash the content path rather than relying on page order, so adding a
+    # page never moves the other pages between shards.
+    digest = hashlib.sha256(page_key(page).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count + 1
+
+
+def partial_index_path(public_dir, index, count):
+    return os.path.join(public_dir, INDEX_DIR, f"shard-{index}-of-{count}.json")
+
+
+def write_partial_index(public_dir, index, count, entries):
+    path = partial_index_path(public_dir, index, count)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entries = sorted(entries, key=lambda entry: entry["path"])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, sort_keys=True)
+    return path
+
+
+def remove_partial_indexes(public_dir):
+    # Partials are build intermediates, never part of the published site.
+    index_dir = os.path.join(public_dir, INDEX_DIR)
+    if not os.path.isdir(index_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(index_dir):
+        if _PARTIAL_RE.match(name):
+            os.remove(os.path.join(index_dir, name))
+            removed += 1
+    if len(os.listdir(index_dir)) == 0:
+        os.rmdir(index_dir)
+    return removed
+
+
+def _read_partial_indexes(public_dir):
+    index_dir = os.path.join(public_dir, INDEX_DIR)
+    partials = {}
+    counts = set()
+    if os.path.isdir(index_dir):
+        for name in os.listdir(index_dir):
+            match = _PARTIAL_RE.match(name)
+            if match:
+                partials[int(match.group(1))] = os.path.join(index_dir, name)
+                counts.add(int(match.group(2)))
+
+    if len(partials) == 0:
+        raise ValueError(f"No partial indexes found in '{index_dir}'")
+    elif len(counts) != 1:
+        raise ValueError(f"Partial indexes disagree on the shard count: {counts}")
+    count = counts.pop()
+    missing = sorted(set(range(1, count + 1)) - set(partials))
+    if missing:
+        raise ValueError(f"Missing partial indexes for shards: {missing}")
+
+    indexes = []
+    for index in sorted(partials):
+        with open(partials[index], encoding="utf-8") as f:
+            indexes.append(json.load(f))
+    return indexes, list(partials.values())
+
+
+def _write(public_dir, name, text):
+    with open(os.path.join(public_dir, name), "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_index(public_dir, entries, base_url=""):
+    # entries must already be sorted by path.
+    links = {entry["path"]: entry["links"] for entry in entries}
+    search = [{"path": entry["path"], "text": entry["text"]} for entry in entries]
+    sitemap = "".join(f"{base_url}/{entry['path']}\n" for entry in entries)
+
+    _write(public_dir, "links.json", json.dumps(links, sort_keys=True))
+    _write(public_dir, "search.json", json.dumps(search, sort_keys=True))
+    _write(public_dir, "sitemap.txt", sitemap)
+    return len(entries)
+
+
+def merge_indexes(public_dir, base_url=""):
+    indexes, paths = _read_partial_indexes(public_dir)
+    # Each partial index is already sorted by path, so a k-way merge keeps
+    # the combined index sorted without re-sorting it.
+    entries = list(heapq.merge(*indexes, key=lambda entry: entry["path"]))
+    write_index(public_dir, entries, base_url)
+
+    for path in paths:
+        os.remove(path)
+    if len(os.listdir(os.path.join(public_dir, INDEX_DIR))) == 0:
+        os.rmdir(os.path.join(public_dir, INDEX_DIR))
+    return len(entries)
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+ENTRY_MODULE = "cli"
+# argparse is the one import the CLI cannot avoid, so the budget covers
+# only what cli adds on top of it, measured in the same interpreter (cli
+# adds about 4 ms). It is still wall-clock time, so the unittest check is
+# opt-in like FUZZ_TIMING: ./timing.sh runs it on an otherwise idle machine.
+STARTUP_TIMING = os.environ.get("STARTUP_TIMING", "") == "1"
+BASELINE_MODULE = "argparse"
+STARTUP_BUDGET_US = 6_000
+STARTUP_REPEAT = 3
+DEFERRED_MODULES = ("build", "shards", "typing", "gzip", "concurrent.futures")
+
+
+def import_times(module=ENTRY_MODULE):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def startup_overhead(times):
+    return times[ENTRY_MODULE] - times[BASELINE_MODULE]
+
+
+def best_import_times(repeat=STARTUP_REPEAT):
+    # The run with the least overhead is the one least disturbed by the rest
+    # of the machine.
+    return min((import_times() for _ in range(repeat)), key=startup_overhead)
+
+
+def main():
+    times = best_import_times()
+    overhead = startup_overhead(times)
+    for name, cumulative in sorted(times.items(), key=lambda item: -item[1])[:10]:
+        print(f"{cumulative:>10} us  {name}")
+    print(
+        f"{ENTRY_MODULE}: {overhead} us over {BASELINE_MODULE} "
+        f"(budget {STARTUP_BUDGET_US} us)"
+    )
+
+    failed = overhead > STARTUP_BUDGET_US
+    for name in DEFERRED_MODULES:
+        if name in times:
+            print(f"{name} should not be imported at startup")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
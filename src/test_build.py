@@ -0,0 +1,216 @@
+import gc
+import os
+import tempfile
+import unittest
+
+from build import (
+    GCMode,
+    GCMonitor,
+    PageCache,
+    build_site,
+    find_pages,
+    index_entry,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    write_if_changed,
+)
+
+
+class TestMarkdownToHTMLNode(unittest.TestCase):
+
+    def test_paragraphs(self):
+        markdown = "This is **bold**\n\nAnd a [link](https://ianwatkins.dev)"
+        expected = (
+            "<div><p>This is <strong>bold</strong></p>"
+            '<p>And a <a href="https://ianwatkins.dev">link</a></p></div>'
+        )
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), expected)
+
+    def test_empty_markdown_raises(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html_node("\n\n  \n\n")
+
+    def test_index_entry(self):
+        blocks = markdown_to_blocks(
+            "Read [this](https://boot.dev) ![pic](a.png)\n\nand **that**"
+        )
+        self.assertEqual(
+            index_entry("index.html", blocks),
+            {
+                "path": "index.html",
+                "links": ["https://boot.dev"],
+                "text": "Read this  and that",
+            },
+        )
+
+
+class TestBuildSite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        os.makedirs(os.path.join(self.content, "blog"))
+        self.write_page("index.md", "Hello   _world_")
+        self.write_page(os.path.join("blog", "post.md"), "A `code  block` here")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_page(self, name, markdown):
+        with open(os.path.join(self.content, name), "w") as f:
+            f.write(markdown)
+
+    def read_output(self, name):
+        with open(os.path.join(self.public, name)) as f:
+            return f.read()
+
+    def test_find_pages(self):
+        self.assertEqual(
+            find_pages(self.content), [os.path.join("blog", "post.md"), "index.md"]
+        )
+
+    def test_builds_pages(self):
+        stats = build_site(self.content, self.public)
+        self.assertEqual(stats["pages"], 2)
+        self.assertEqual(stats["written"], 2)
+        self.assertEqual(
+            self.read_output("index.html"), "<div><p>Hello   <em>world</em></p></div>"
+        )
+
+    def test_minify(self):
+        build_site(self.content, self.public, minify=True)
+        self.assertEqual(
+            self.read_output("index.html"), "<div><p>Hello <em>world</em></p></div>"
+        )
+        self.assertEqual(
+            self.read_output(os.path.join("blog", "post.html")),
+            "<div><p>A <code>code  block</code> here</p></div>",
+        )
+
+    def test_unchanged_pages_are_skipped(self):
+        build_site(self.content, self.public, compress=True)
+        stats = build_site(self.content, self.public, compress=True)
+        self.assertEqual(stats["written"], 0)
+        self.assertEqual(stats["unchanged"], 2)
+        self.assertEqual(stats["compressed"], 0)
+
+    def test_compress(self):
+        stats = build_site(self.content, self.public, compress=True)
+        self.assertGreaterEqual(stats["compressed"], 2)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html.gz")))
+
+    def test_rewritten_pages_drop_stale_siblings(self):
+        build_site(self.content, self.public, compress=True)
+        self.write_page("index.md", "Hello again")
+
+        build_site(self.content, self.public)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html.gz")))
+        self.assertTrue(
+            os.path.exists(os.path.join(self.public, "blog", "post.html.gz"))
+        )
+
+    def test_gc_modes_report_stats(self):
+        for mode in ("default", "freeze", "batch"):
+            stats = build_site(self.content, self.public, gc_mode=mode)
+            self.assertEqual(stats["gc_mode"], mode)
+            self.assertGreaterEqual(stats["gc_collections"], 0)
+            self.assertGreaterEqual(stats["gc_time"], 0)
+
+    def test_unknown_gc_mode(self):
+        with self.assertRaises(ValueError):
+            build_site(self.content, self.public, gc_mode="never")
+
+    def test_image_dimensions(self):
+        static = os.path.join(self.tmp.name, "static")
+        os.makedirs(os.path.join(static, "images"))
+        with open(os.path.join(static, "images", "a.gif"), "wb") as f:
+            f.write(b"GIF89a" + (4).to_bytes(2, "little") + (3).to_bytes(2, "little"))
+        self.write_page(
+            "index.md", "![local](/images/a.gif) ![remote](https://example.com/b.png)"
+        )
+        cache = os.path.join(self.tmp.name, "cache.json")
+
+        stats = build_site(
+            self.content, self.public, static_dir=static, image_cache=cache
+        )
+        self.assertEqual(stats["images"], 1)
+        self.assertEqual(stats["image_cache_misses"], 1)
+        self.assertEqual(
+            self.read_output("index.html"),
+            '<div><p><img src="/images/a.gif" alt="local" loading="lazy" '
+            'width="4" height="3"></img> '
+            '<img src="https://example.com/b.png" alt="remote"></img></p></div>',
+        )
+
+        stats = build_site(
+            self.content, self.public, static_dir=static, image_cache=cache
+        )
+        self.assertEqual(stats["image_cache_hits"], 1)
+        self.assertEqual(stats["image_cache_misses"], 0)
+
+
+class TestGCMode(unittest.TestCase):
+
+    def test_restores_collector_state(self):
+        threshold = gc.get_threshold()
+        for mode in ("freeze", "batch"):
+            with GCMode(mode):
+                self.assertGreater(gc.get_freeze_count(), 0)
+            self.assertTrue(gc.isenabled())
+            self.assertEqual(gc.get_threshold(), threshold)
+            self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_keeps_callers_frozen_objects(self):
+        gc.freeze()
+        try:
+            frozen = gc.get_freeze_count()
+            for mode in ("freeze", "batch"):
+                with GCMode(mode):
+                    pass
+                self.assertEqual(gc.get_freeze_count(), frozen)
+        finally:
+            gc.unfreeze()
+
+    def test_batch_disables_collector(self):
+        with GCMode("batch"):
+            self.assertFalse(gc.isenabled())
+
+    def test_monitor_counts_collections(self):
+        with GCMonitor() as monitor:
+            gc.collect()
+        self.assertEqual(monitor.collections, 1)
+        self.assertNotIn(monitor, gc.callbacks)
+
+
+class TestPageCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = PageCache(max_pages=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_key_depends_on_content_and_options(self):
+        key = PageCache.key("index.md", "Hello", False, None)
+        self.assertEqual(key, PageCache.key("index.md", "Hello", False, None))
+        self.assertNotEqual(key, PageCache.key("index.md", "Hello!", False, None))
+        self.assertNotEqual(key, PageCache.key("index.md", "Hello", True, None))
+
+
+class TestWriteIfChanged(unittest.TestCase):
+
+    def test_write_if_changed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out", "page.html")
+            self.assertTrue(write_if_changed(path, b"a"))
+            self.assertFalse(write_if_changed(path, b"a"))
+            self.assertTrue(write_if_changed(path, b"b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import contextlib
+import io
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from cli import main
+from client import DAEMON_UNAVAILABLE, send_request
+from daemon import BuildDaemon, BuildServer
+
+
+class DaemonTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.public = os.path.join(self.tmp.name, "public")
+        os.makedirs(self.content)
+        self.write_page("index.md", "Hello **world** [home](/index.html)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_page(self, name, markdown):
+        with open(os.path.join(self.content, name), "w") as f:
+            f.write(markdown)
+
+    def options(self):
+        return {"content_dir": self.content, "public_dir": self.public}
+
+
+class TestBuildDaemon(DaemonTestCase):
+
+    def test_rebuild_uses_page_cache(self):
+        daemon = BuildDaemon()
+        first = daemon.build(self.options())
+        second = daemon.build(self.options())
+        self.assertEqual(first["page_cache_misses"], 1)
+        self.assertEqual(second["page_cache_hits"], 1)
+        self.assertEqual(second["page_cache_misses"], 0)
+        self.assertEqual(daemon.stats()["builds"], 2)
+
+    def test_changed_page_is_rerendered(self):
+        daemon = BuildDaemon()
+        daemon.build(self.options())
+        self.write_page("index.md", "Changed")
+        stats = daemon.build(self.options())
+        self.assertEqual(stats["page_cache_misses"], 1)
+        self.assertEqual(stats["written"], 1)
+        with open(os.path.join(self.public, "index.html")) as f:
+            self.assertEqual(f.read(), "<div><p>Changed</p></div>")
+
+    def test_unknown_option(self):
+        with self.assertRaises(ValueError):
+            BuildDaemon().build(dict(self.options(), fast=True))
+
+    def test_unknown_command(self):
+        with self.assertRaises(ValueError):
+            BuildDaemon().handle({"command": "deploy"})
+
+
+class TestBuildServer(DaemonTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.socket_path = os.path.join(self.tmp.name, "build.sock")
+        self.server = BuildServer(self.socket_path, request_timeout=0.5)
+        self.thread = threading.Thread(target=self.server.serve_until_shutdown)
+        self.thread.start()
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            send_request(self.socket_path, {"command": "shutdown"}, timeout=5)
+        self.thread.join(timeout=5)
+        super().tearDown()
+
+    def request(self, request):
+        return send_request(self.socket_path, request, timeout=5)
+
+    def test_build_and_stats(self):
+        stats = self.request({"command": "build", "options": self.options()})
+        self.assertEqual(stats["pages"], 1)
+        self.request({"command": "build", "options": self.options()})
+
+        stats = self.request({"command": "stats"})
+        self.assertEqual(stats["builds"], 2)
+        self.assertEqual(stats["page_cache_hits"], 1)
+        self.assertEqual(stats["page_cache_size"], 1)
+
+    def test_sharded_build_and_merge(self):
+        options = dict(self.options(), shard=[1, 1])
+        stats = self.request({"command": "build", "options": options})
+        self.assertEqual(stats["pages"], 1)
+        stats = self.request({"command": "merge", "options": self.options()})
+        self.assertEqual(stats, {"pages": 1})
+
+    def test_errors_are_reported(self):
+        with self.assertRaises(RuntimeError):
+            self.request({"command": "deploy"})
+        self.assertEqual(self.request({"command": "stats"})["builds"], 0)
+
+    def test_malformed_requests_are_reported(self):
+        bad_options = dict(self.options(), content_dir=5)
+        for request in (
+            [],
+            "build",
+            {"command": "build", "options": None},
+            {"command": "merge", "options": []},
+            {"command": "build", "options": bad_options},
+        ):
+            # An error reply, not "closed the connection without replying".
+            with self.assertRaisesRegex(RuntimeError, r"^(Type|Value)Error: "):
+                self.request(request)
+        self.assertEqual(self.request({"command": "stats"})["builds"], 0)
+
+    def test_stalled_client_is_dropped(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+            stalled.connect(self.socket_path)
+            stalled.sendall(b'{"command": "stats"')
+            self.assertEqual(self.request({"command": "stats"})["builds"], 0)
+
+    def test_shutdown_removes_socket(self):
+        self.request({"command": "shutdown"})
+        self.thread.join(timeout=5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_refuses_live_socket(self):
+        with self.assertRaises(FileExistsError):
+            BuildServer(self.socket_path, request_timeout=0.5)
+        self.assertEqual(self.request({"command": "stats"})["builds"], 0)
+
+
+class TestSocketPath(DaemonTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.socket_path = os.path.join(self.tmp.name, "build.sock")
+
+    def test_refuses_regular_file(self):
+        with open(self.socket_path, "w") as f:
+            f.write("keep me")
+        with self.assertRaises(FileExistsError):
+            BuildServer(self.socket_path, request_timeout=0.5)
+        with open(self.socket_path) as f:
+            self.assertEqual(f.read(), "keep me")
+
+    def test_replaces_stale_socket(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(self.socket_path)
+        server = BuildServer(self.socket_path, request_timeout=0.5)
+        server.close()
+        server.close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_connect_without_daemon_exits_unavailable(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as raised:
+                main(["--connect", self.socket_path, "--daemon-stats"])
+        self.assertEqual(raised.exception.code, DAEMON_UNAVAILABLE)
+
+    def test_sigterm_removes_socket(self):
+        src = os.path.dirname(os.path.abspath(__file__))
+        process = subprocess.Popen(
+            [sys.executable, "main.py", "--serve", self.socket_path], cwd=src
+        )
+        try:
+            deadline = time.monotonic() + 10
+            while not os.path.exists(self.socket_path):
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+            process.send_signal(signal.SIGTERM)
+            self.assertEqual(process.wait(timeout=10), 128 + signal.SIGTERM)
+        finally:
+            process.kill()
+            process.wait()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import unittest
+
+from build import blocks_to_html_node, index_entry, markdown_to_blocks, render_pages
+from fuzz import (
+    FUZZ_ITERATIONS,
+    FUZZ_SEED,
+    FUZZ_TIMING,
+    GROWTH_STEP,
+    adversarial_inputs,
+    best_time,
+    growth_ratio,
+    is_superlinear,
+    new_rng,
+    random_markdown,
+    reference_split_nodes_image,
+    reference_split_nodes_link,
+    reference_to_html,
+    run_outcome,
+    time_budget,
+)
+from htmlnode import LeafNode, ParentNode
+from inline import (
+    extract_markdown_images,
+    extract_markdown_links,
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from minify import minify_html
+from textnode import TextNode, TextType
+
+
+def nested_parents(depth):
+    node = LeafNode("b", "x")
+    for _ in range(depth):
+        node = ParentNode("span", [node])
+    return node
+
+
+def random_tree(rng, depth):
+    if depth == 0 or rng.random() < 0.3:
+        tag = rng.choice((None, "b", "a", "code"))
+        props = {"href": "/x"} if tag == "a" else None
+        return LeafNode(tag, rng.choice(("x", "", "a b")), props)
+    children = [random_tree(rng, depth - 1) for _ in range(rng.randint(0, 3))]
+    props = rng.choice((None, {}, {"class": "c"}))
+    return ParentNode(rng.choice(("div", "p", None)), children, props)
+
+
+def render_node_page(page, markdown):
+    blocks = markdown_to_blocks(markdown)
+    html = blocks_to_html_node(blocks).to_html()
+    return html, index_entry(page.replace(".md", ".html"), blocks)
+
+
+def render_batch_page(page, markdown):
+    return next(render_pages([(page, markdown, None)]))
+
+
+def reference_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = reference_split_nodes_image(nodes)
+    nodes = reference_split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return nodes
+
+
+class TestDifferential(unittest.TestCase):
+
+    def assert_same_outcome(self, label, expected, actual):
+        self.assertEqual(
+            run_outcome(*expected),
+            run_outcome(*actual),
+            f"FUZZ_SEED={FUZZ_SEED} input={label!r}",
+        )
+
+    def test_splitters_match_reference(self):
+        rng = new_rng()
+        for _ in range(FUZZ_ITERATIONS):
+            text = random_markdown(rng, rng.randint(0, 200))
+            nodes = [TextNode(text, TextType.TEXT)]
+            self.assert_same_outcome(
+                text, (reference_split_nodes_image, nodes), (split_nodes_image, nodes)
+            )
+            self.assert_same_outcome(
+                text, (reference_split_nodes_link, nodes), (split_nodes_link, nodes)
+            )
+
+    def test_pipeline_matches_reference(self):
+        rng = new_rng(1)
+        for _ in range(FUZZ_ITERATIONS):
+            text = random_markdown(rng, rng.randint(0, 200), noise=0.02)
+            self.assert_same_outcome(
+                text, (reference_text_to_textnodes, text), (text_to_textnodes, text)
+            )
+
+    def test_to_html_matches_reference(self):
+        rng = new_rng(3)
+        for _ in range(FUZZ_ITERATIONS):
+            tree = random_tree(rng, 4)
+            self.assert_same_outcome(
+                tree, (reference_to_html, tree), (lambda: tree.to_html(),)
+            )
+
+    def test_batch_pages_match_node_pages(self):
+        rng = new_rng(4)
+        for _ in range(FUZZ_ITERATIONS):
+            markdown = "\n\n".join(
+                random_markdown(rng, rng.randint(0, 60), noise=0.02)
+                for _ in range(rng.randint(1, 4))
+            )
+            self.assert_same_outcome(
+                markdown,
+                (render_node_page, "page.md", markdown),
+                (render_batch_page, "page.md", markdown),
+            )
+
+
+class TestDeepNesting(unittest.TestCase):
+
+    def test_deep_nesting(self):
+        depth = 5000
+        html = nested_parents(depth).to_html()
+        self.assertEqual(html, "<span>" * depth + "<b>x</b>" + "</span>" * depth)
+
+
+@unittest.skipUnless(FUZZ_TIMING, "set FUZZ_TIMING=1 to run wall-clock checks")
+class TestTimeBudget(unittest.TestCase):
+
+    def assert_within_budget(self, name, func, text):
+        elapsed = best_time(run_outcome, func, text, repeat=1)
+        self.assertLessEqual(
+            elapsed,
+            time_budget(len(text)),
+            f"{func.__name__} on {name} ({len(text)} chars) took {elapsed:.3f}s",
+        )
+
+    def test_adversarial_inputs(self):
+        for name, text in adversarial_inputs(5000).items():
+            for func in (
+                extract_markdown_images,
+                extract_markdown_links,
+                text_to_textnodes,
+                minify_html,
+            ):
+                self.assert_within_budget(name, func, text)
+
+    def test_random_inputs(self):
+        rng = new_rng(2)
+        for _ in range(10):
+            text = random_markdown(rng, 20_000, noise=0.3)
+            self.assert_within_budget("random", text_to_textnodes, text)
+
+
+@unittest.skipUnless(FUZZ_TIMING, "set FUZZ_TIMING=1 to run wall-clock checks")
+class TestGrowth(unittest.TestCase):
+
+    def assert_linear(self, name, func, make_input, n=1000):
+        ratio = growth_ratio(func, make_input, n)
+        self.assertFalse(
+            is_superlinear(ratio),
+            f"{name} grew {ratio:.1f}x for a {GROWTH_STEP}x larger input",
+        )
+
+    def test_extractors(self):
+        for name in ("open_brackets", "unclosed_links", "nested_brackets"):
+            make_input = lambda n, name=name: adversarial_inputs(n)[name]
+            self.assert_linear(name, extract_markdown_links, make_input)
+            self.assert_linear(name, extract_markdown_images, make_input)
+
+    def test_splitters(self):
+        # Re-copying the remaining text after every match is cheap until
+        # the text gets long, so these need bigger inputs to show up.
+        self.assert_linear(
+            "split_nodes_link",
+            split_nodes_link,
+            lambda n: [TextNode(adversarial_inputs(n)["many_links"], TextType.TEXT)],
+            n=4000,
+        )
+        self.assert_linear(
+            "split_nodes_image",
+            split_nodes_image,
+            lambda n: [TextNode(adversarial_inputs(n)["many_images"], TextType.TEXT)],
+            n=4000,
+        )
+        self.assert_linear(
+            "text_to_textnodes",
+            text_to_textnodes,
+            lambda n: adversarial_inputs(n)["many_delimiters"],
+        )
+
+    def test_nested_to_html(self):
+        self.assert_linear(
+            "ParentNode.to_html", lambda node: node.to_html(), nested_parents, n=200
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
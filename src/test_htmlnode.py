@@ -1,6 +1,14 @@
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import (
+    HTMLNode,
+    LeafNode,
+    ParentNode,
+    RenderContext,
+    text_node_to_html,
+    text_node_to_leaf,
+)
+from textnode import TextNode, TextType
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -178,5 +186,104 @@ class TestTextToHTML(unittest.TestCase):
         self.assertEqual(node.to_html(), "<code>Code snippet</code>")
 
 
+class TestTextNodeToHTML(unittest.TestCase):
+
+    def test_image(self):
+        node = TextNode("alt text", TextType.IMAGES, "/img.png")
+        self.assertEqual(
+            text_node_to_html(node), '<img src="/img.png" alt="alt text"></img>'
+        )
+
+    def test_image_props(self):
+        node = TextNode("alt text", TextType.IMAGES, "/img.png")
+        props = {"width": "10", "height": "20", "loading": "lazy"}
+        self.assertEqual(
+            text_node_to_html(node, props),
+            '<img src="/img.png" alt="alt text" width="10" height="20" '
+            'loading="lazy"></img>',
+        )
+
+    def test_text_node_to_leaf(self):
+        node = TextNode("link", TextType.LINKS, "https://boot.dev")
+        leaf = text_node_to_leaf(node)
+        self.assertIsInstance(leaf, LeafNode)
+        self.assertEqual(leaf.props, {"href": "https://boot.dev"})
+
+
+class TestRenderContext(unittest.TestCase):
+
+    def page(self, text):
+        return ParentNode(
+            "div",
+            [
+                ParentNode(
+                    "p",
+                    [
+                        LeafNode(None, text),
+                        LeafNode("a", "home", {"href": "/index.html"}),
+                        LeafNode("b", "bold"),
+                    ],
+                    {"class": "content"},
+                )
+            ],
+        )
+
+    def test_matches_to_html(self):
+        page = self.page("Hello ")
+        self.assertEqual(RenderContext().render(page), page.to_html())
+
+    def test_reuse_across_pages(self):
+        context = RenderContext()
+        first = context.render(self.page("A much longer first page "))
+        second = context.render(self.page("B "))
+        self.assertEqual(first, self.page("A much longer first page ").to_html())
+        self.assertEqual(second, self.page("B ").to_html())
+
+    def test_caches_repeated_props(self):
+        context = RenderContext()
+        context.render(self.page("A"))
+        misses = context.props_misses
+        context.render(self.page("B"))
+        self.assertEqual(context.props_misses, misses)
+        self.assertEqual(context.props_hits, 4)
+
+    def test_cache_limit(self):
+        context = RenderContext(max_cached_props=1)
+        context.render(self.page("A"))
+        context.render(self.page("A"))
+        self.assertEqual(context.props_hits, 1)
+
+    def test_none_and_empty_props_are_cached_separately(self):
+        context = RenderContext()
+        self.assertEqual(
+            context.render(ParentNode("p", [LeafNode("a", "x")])), "<p><a>x</a></p>"
+        )
+        node = LeafNode("a", "x", {})
+        self.assertEqual(context.render(node), node.to_html())
+        self.assertEqual(context.render(node), "<a >x</a>")
+
+    def test_equal_values_that_render_differently(self):
+        context = RenderContext()
+        for value in (True, 1, 1.0, 0.0, -0.0, "1"):
+            node = LeafNode("input", "", {"checked": value})
+            self.assertEqual(context.render(node), node.to_html())
+
+    def test_unhashable_props(self):
+        node = LeafNode("a", "x", {"class": ["one", "two"]})
+        self.assertEqual(
+            RenderContext().render(node), "<a class=\"['one', 'two']\">x</a>"
+        )
+
+    def test_errors_reset_buffer(self):
+        context = RenderContext()
+        with self.assertRaises(ValueError):
+            context.render(
+                ParentNode("div", [LeafNode("b", "ok"), LeafNode("b", None)])
+            )
+        with self.assertRaises(ValueError):
+            context.render(ParentNode("div", []))
+        self.assertEqual(context.render(LeafNode("b", "ok")), "<b>ok</b>")
+
+
 if __name__ == "__main__":
     unittest.main()
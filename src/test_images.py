@@ -0,0 +1,186 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+from images import (
+    ImageSizeCache,
+    image_props,
+    image_sizes,
+    is_local_url,
+    read_image_size,
+    resolve_image_path,
+)
+
+
+def png_bytes(width, height):
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr
+    crc = struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+    return b"\x89PNG\r\n\x1a\n" + chunk + crc
+
+
+def gif_bytes(width, height):
+    return b"GIF89a" + struct.pack("<HH", width, height) + b"\x00" * 16
+
+
+def jpeg_bytes(width, height):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1)
+    sof0 += b"\x00" * 3
+    return b"\xff\xd8" + app0 + sof0 + b"\xff\xd9"
+
+
+def webp_bytes(chunk, payload):
+    body = b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+class TestReadImageSize(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_png(self):
+        path = self.write("a.png", png_bytes(640, 480))
+        self.assertEqual(read_image_size(path), (640, 480))
+
+    def test_gif(self):
+        path = self.write("a.gif", gif_bytes(32, 16))
+        self.assertEqual(read_image_size(path), (32, 16))
+
+    def test_jpeg(self):
+        path = self.write("a.jpg", jpeg_bytes(1920, 1080))
+        self.assertEqual(read_image_size(path), (1920, 1080))
+
+    def test_webp_lossy(self):
+        payload = b"\x00" * 3 + b"\x9d\x01\x2a" + struct.pack("<HH", 300, 200)
+        path = self.write("a.webp", webp_bytes(b"VP8 ", payload))
+        self.assertEqual(read_image_size(path), (300, 200))
+
+    def test_webp_lossless(self):
+        bits = (300 - 1) | ((200 - 1) << 14)
+        payload = b"\x2f" + bits.to_bytes(4, "little")
+        path = self.write("a.webp", webp_bytes(b"VP8L", payload))
+        self.assertEqual(read_image_size(path), (300, 200))
+
+    def test_webp_extended(self):
+        payload = b"\x00" * 4 + (300 - 1).to_bytes(3, "little")
+        payload += (200 - 1).to_bytes(3, "little")
+        path = self.write("a.webp", webp_bytes(b"VP8X", payload))
+        self.assertEqual(read_image_size(path), (300, 200))
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            read_image_size(self.write("a.txt", b"not an image"))
+
+    def test_truncated_jpeg(self):
+        with self.assertRaises(ValueError):
+            read_image_size(self.write("a.jpg", b"\xff\xd8\xff\xe0"))
+
+    def test_jpeg_truncated_in_fill_bytes(self):
+        with self.assertRaises(ValueError):
+            read_image_size(self.write("a.jpg", b"\xff\xd8\xff\xff"))
+
+    def test_jpeg_truncated_in_frame_header(self):
+        data = b"\xff\xd8\xff\xc0\x00\x11\x08\x04"
+        with self.assertRaises(ValueError):
+            read_image_size(self.write("a.jpg", data))
+
+
+class TestImageSizes(unittest.TestCase):
+
+    def test_sizes_and_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            png = os.path.join(tmp, "a.png")
+            with open(png, "wb") as f:
+                f.write(png_bytes(4, 3))
+            broken = os.path.join(tmp, "b.png")
+            with open(broken, "wb") as f:
+                f.write(b"broken")
+            cache_path = os.path.join(tmp, "cache", "sizes.json")
+
+            cache = ImageSizeCache(cache_path)
+            missing = os.path.join(tmp, "missing.png")
+            sizes = image_sizes([png, broken, png, missing], cache)
+            cache.save()
+            self.assertEqual(sizes[png], (4, 3))
+            self.assertIsNone(sizes[broken])
+            self.assertIsNone(sizes[missing])
+
+            cache = ImageSizeCache(cache_path)
+            self.assertEqual(image_sizes([png], cache), {png: (4, 3)})
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual(cache.misses, 0)
+
+    def test_changed_image_is_reread(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            png = os.path.join(tmp, "a.png")
+            with open(png, "wb") as f:
+                f.write(png_bytes(4, 3))
+            cache = ImageSizeCache()
+            image_sizes([png], cache)
+
+            with open(png, "wb") as f:
+                f.write(gif_bytes(8, 6) + b"\x00" * 100)
+            self.assertEqual(image_sizes([png], cache), {png: (8, 6)})
+            self.assertEqual(cache.misses, 2)
+
+    def test_corrupt_cache_starts_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            png = os.path.join(tmp, "a.png")
+            with open(png, "wb") as f:
+                f.write(png_bytes(4, 3))
+            cache_path = os.path.join(tmp, "sizes.json")
+            for contents in ("{", "[]", '{"a.png": 1}'):
+                with open(cache_path, "w") as f:
+                    f.write(contents)
+
+                cache = ImageSizeCache(cache_path)
+                self.assertEqual(cache.entries, {})
+                self.assertEqual(image_sizes([png], cache), {png: (4, 3)})
+                cache.save()
+                self.assertEqual(ImageSizeCache(cache_path).get(png), [4, 3])
+            self.assertEqual(sorted(os.listdir(tmp)), ["a.png", "sizes.json"])
+
+
+class TestImageHelpers(unittest.TestCase):
+
+    def test_is_local_url(self):
+        self.assertTrue(is_local_url("/images/a.png"))
+        self.assertTrue(is_local_url("a.png"))
+        self.assertFalse(is_local_url("https://i.imgur.com/fJRm4Vk.jpeg"))
+        self.assertFalse(is_local_url("//cdn.example.com/a.png"))
+        self.assertFalse(is_local_url("data:image/png;base64,AAAA"))
+
+    def test_resolve_image_path(self):
+        self.assertEqual(
+            resolve_image_path(
+                "/images/a.png?v=2", os.path.join("blog", "post.md"), "static"
+            ),
+            os.path.join("static", "images", "a.png"),
+        )
+        self.assertEqual(
+            resolve_image_path("a.png", os.path.join("blog", "post.md"), "static"),
+            os.path.join("static", "blog", "a.png"),
+        )
+
+    def test_image_props(self):
+        self.assertEqual(
+            image_props((4, 3)), {"loading": "lazy", "width": "4", "height": "3"}
+        )
+        self.assertEqual(image_props(None), {"loading": "lazy"})
+
+
+if __name__ == "__main__":
+    unittest.main()
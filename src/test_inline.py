@@ -7,6 +7,7 @@ from inline import (
     split_nodes_delimiter,
     split_nodes_image,
     split_nodes_link,
+    text_to_textnodes,
 )
 from textnode import TextNode, TextType
 
@@ -434,5 +435,44 @@ class TestSplitNodesLink(unittest.TestCase):
         self.assertEqual(split_nodes_link(nodes), expected)
 
 
+class TestTextToTextNodes(unittest.TestCase):
+    def test_all_types(self):
+        text = (
+            "This is **text** with an _italic_ word and a `code block` and an "
+            "![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a "
+            "[link](https://boot.dev)"
+        )
+        expected = [
+            TextNode("This is ", TextType.TEXT),
+            TextNode("text", TextType.BOLD),
+            TextNode(" with an ", TextType.TEXT),
+            TextNode("italic", TextType.ITALIC),
+            TextNode(" word and a ", TextType.TEXT),
+            TextNode("code block", TextType.CODE),
+            TextNode(" and an ", TextType.TEXT),
+            TextNode(
+                "obi wan image", TextType.IMAGES, "https://i.imgur.com/fJRm4Vk.jpeg"
+            ),
+            TextNode(" and a ", TextType.TEXT),
+            TextNode("link", TextType.LINKS, "https://boot.dev"),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_underscore_in_url(self):
+        text = "See [my_page](https://example.com/my_page) _now_"
+        expected = [
+            TextNode("See ", TextType.TEXT),
+            TextNode("my_page", TextType.LINKS, "https://example.com/my_page"),
+            TextNode(" ", TextType.TEXT),
+            TextNode("now", TextType.ITALIC),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_plain_text(self):
+        self.assertEqual(
+            text_to_textnodes("just text"), [TextNode("just text", TextType.TEXT)]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
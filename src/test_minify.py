@@ -0,0 +1,99 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from minify import compressed_suffixes, minify_html, precompress
+
+
+class TestMinifyHTML(unittest.TestCase):
+
+    def test_collapses_whitespace(self):
+        html = "<p>Some   text\n  here</p>"
+        self.assertEqual(minify_html(html), "<p>Some text here</p>")
+
+    def test_keeps_tags_intact(self):
+        html = '<a href="https://ianwatkins.dev">a  link</a>'
+        self.assertEqual(
+            minify_html(html), '<a href="https://ianwatkins.dev">a link</a>'
+        )
+
+    def test_preserves_code(self):
+        html = "<p>a  b<code>x  =\n  1</code>c  d</p>"
+        self.assertEqual(minify_html(html), "<p>a b<code>x  =\n  1</code>c d</p>")
+
+    def test_preserves_nested_pre_code(self):
+        html = "<pre><code>if x:\n    y</code>\n\n</pre>  z"
+        self.assertEqual(
+            minify_html(html), "<pre><code>if x:\n    y</code>\n\n</pre> z"
+        )
+
+    def test_less_than_in_code(self):
+        html = "<code>a  < b</code>  c"
+        self.assertEqual(minify_html(html), "<code>a  < b</code> c")
+
+    def test_keeps_unicode_spaces(self):
+        html = "<p>10\u00a0km  in\u2009a\u3000row</p>"
+        self.assertEqual(minify_html(html), "<p>10\u00a0km in\u2009a\u3000row</p>")
+
+    def test_plain_text(self):
+        self.assertEqual(minify_html("  a  b  "), " a b ")
+
+    def test_empty_string(self):
+        self.assertEqual(minify_html(""), "")
+
+
+class TestPrecompress(unittest.TestCase):
+
+    def test_writes_siblings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with open(path, "wb") as f:
+                f.write(b"<p>hello</p>")
+
+            written = precompress([path])
+
+            self.assertEqual(
+                written, [path + suffix for suffix in compressed_suffixes()]
+            )
+            with gzip.open(path + ".gz") as f:
+                self.assertEqual(f.read(), b"<p>hello</p>")
+
+    def test_skips_up_to_date_siblings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with open(path, "wb") as f:
+                f.write(b"<p>hello</p>")
+
+            precompress([path])
+            self.assertEqual(precompress([path]), [])
+
+    def test_rewrites_stale_siblings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with open(path, "wb") as f:
+                f.write(b"<p>hello</p>")
+            precompress([path])
+
+            with open(path, "wb") as f:
+                f.write(b"<p>changed</p>")
+
+            self.assertIn(path + ".gz", precompress([path]))
+            with gzip.open(path + ".gz") as f:
+                self.assertEqual(f.read(), b"<p>changed</p>")
+
+    def test_rewrites_corrupt_siblings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            with open(path, "wb") as f:
+                f.write(b"<p>hello</p>")
+            with open(path + ".gz", "wb") as f:
+                f.write(b"not gzip")
+
+            self.assertIn(path + ".gz", precompress([path]))
+            with gzip.open(path + ".gz") as f:
+                self.assertEqual(f.read(), b"<p>hello</p>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from options import format_stats, parse_shard
+
+
+class TestParseShard(unittest.TestCase):
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("1/4"), (1, 4))
+        self.assertEqual(parse_shard("4/4"), (4, 4))
+
+    def test_invalid_shards(self):
+        for value in ("0/4", "5/4", "1/0", "1", "a/b", "1/2/3"):
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+
+class TestFormatStats(unittest.TestCase):
+
+    def test_one_line_per_stat(self):
+        self.assertEqual(
+            format_stats({"pages": 2, "gc_mode": "freeze"}), "pages: 2\ngc_mode: freeze"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import filecmp
+import os
+import tempfile
+import unittest
+
+from build import build_site
+from shards import INDEX_DIR, merge_indexes, shard_for
+
+
+class TestShardFor(unittest.TestCase):
+
+    def test_deterministic(self):
+        self.assertEqual(shard_for("blog/post.md", 7), shard_for("blog/post.md", 7))
+
+    def test_in_range_and_spread(self):
+        pages = [f"page-{i}.md" for i in range(200)]
+        shards = {shard_for(page, 4) for page in pages}
+        self.assertEqual(shards, {1, 2, 3, 4})
+
+    def test_single_shard(self):
+        self.assertEqual(shard_for("index.md", 1), 1)
+
+
+class TestShardedBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        os.makedirs(os.path.join(self.content, "blog"))
+        for i in range(12):
+            name = os.path.join("blog" if i % 2 else "", f"page-{i}.md")
+            with open(os.path.join(self.content, name), "w") as f:
+                f.write(f"Page **{i}** links to [next](/page-{i + 1}.html)")
+                f.write("\n\nMore _text_")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sharded_build_matches_single_build(self):
+        single = os.path.join(self.tmp.name, "single")
+        sharded = os.path.join(self.tmp.name, "sharded")
+        build_site(self.content, single, base_url="https://ianwatkins.dev")
+
+        pages = 0
+        for index in range(1, 4):
+            stats = build_site(self.content, sharded, shard=(index, 3))
+            pages += stats["pages"]
+        self.assertEqual(pages, 12)
+        self.assertEqual(merge_indexes(sharded, "https://ianwatkins.dev"), 12)
+
+        comparison = filecmp.dircmp(single, sharded)
+        self.assert_identical(comparison)
+        self.assertFalse(os.path.exists(os.path.join(sharded, INDEX_DIR)))
+
+    def assert_identical(self, comparison):
+        self.assertEqual(comparison.left_only, [])
+        self.assertEqual(comparison.right_only, [])
+        _, mismatch, errors = filecmp.cmpfiles(
+            comparison.left, comparison.right, comparison.common_files, shallow=False
+        )
+        self.assertEqual(mismatch + errors, [])
+        for sub in comparison.subdirs.values():
+            self.assert_identical(sub)
+
+    def test_index_files(self):
+        public = os.path.join(self.tmp.name, "public")
+        build_site(self.content, public)
+        with open(os.path.join(public, "sitemap.txt")) as f:
+            sitemap = f.read().splitlines()
+        self.assertEqual(len(sitemap), 12)
+        self.assertIn("/blog/page-1.html", sitemap)
+        self.assertEqual(sitemap, sorted(sitemap))
+
+    def test_single_build_removes_stale_partials(self):
+        public = os.path.join(self.tmp.name, "public")
+        build_site(self.content, public, shard=(2, 3))
+
+        stats = build_site(self.content, public)
+        self.assertEqual(stats["pages"], 12)
+        self.assertEqual(stats["stale_partials"], 1)
+        self.assertFalse(os.path.exists(os.path.join(public, INDEX_DIR)))
+        with open(os.path.join(public, "sitemap.txt")) as f:
+            self.assertEqual(len(f.read().splitlines()), 12)
+
+    def test_shard_build_rejects_base_url(self):
+        public = os.path.join(self.tmp.name, "public")
+        with self.assertRaises(ValueError):
+            build_site(self.content, public, shard=(1, 2), base_url="https://x")
+
+    def test_merge_requires_every_shard(self):
+        public = os.path.join(self.tmp.name, "public")
+        build_site(self.content, public, shard=(1, 2))
+        with self.assertRaises(ValueError):
+            merge_indexes(public)
+
+    def test_merge_without_partials(self):
+        with self.assertRaises(ValueError):
+            merge_indexes(os.path.join(self.tmp.name, "empty"))
+
+
+if __name__ == "__main__":
+    unittest.main()
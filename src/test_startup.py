@@ -0,0 +1,29 @@
+import unittest
+
+from startup import (
+    DEFERRED_MODULES,
+    STARTUP_BUDGET_US,
+    STARTUP_TIMING,
+    best_import_times,
+    import_times,
+    startup_overhead,
+)
+
+
+class TestStartup(unittest.TestCase):
+
+    @unittest.skipUnless(
+        STARTUP_TIMING, "set STARTUP_TIMING=1 to run wall-clock checks"
+    )
+    def test_within_budget(self):
+        times = best_import_times()
+        self.assertLessEqual(startup_overhead(times), STARTUP_BUDGET_US)
+
+    def test_deferred_modules_not_imported(self):
+        times = import_times()
+        for name in DEFERRED_MODULES:
+            self.assertNotIn(name, times)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+
+from build import blocks_to_html_node, index_entry, markdown_to_blocks
+from htmlnode import RenderContext
+from inline import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textbatch import (
+    TextNodeBatch,
+    batch_index_entry,
+    render_batch,
+    split_batch_delimiter,
+    split_batch_image,
+    split_batch_link,
+    texts_to_batch,
+)
+from textnode import TextNode, TextType
+
+PARAGRAPHS = [
+    "This is **text** with an _italic_ word and a `code block`",
+    "An ![obi wan](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+    "![first](a.png)![second](b.png)",
+    "[only link](https://ianwatkins.dev)",
+    "",
+    "plain text with no markup",
+    "`**not bold**` and **bold** with _italic_ text",
+]
+
+
+class TestTextNodeBatch(unittest.TestCase):
+
+    def test_from_texts(self):
+        batch = TextNodeBatch.from_texts(["one", "two"])
+        self.assertEqual(batch.source, "onetwo")
+        self.assertEqual(
+            batch.to_nodes(),
+            [TextNode("one", TextType.TEXT), TextNode("two", TextType.TEXT)],
+        )
+        self.assertEqual(list(batch.groups), [0, 1])
+
+    def test_getitem(self):
+        batch = split_batch_link(
+            TextNodeBatch.from_texts(["a [link](https://boot.dev)"])
+        )
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(
+            batch[-1], TextNode("link", TextType.LINKS, "https://boot.dev")
+        )
+        self.assertIsNone(batch[0].url)
+        with self.assertRaises(IndexError):
+            batch[2]
+
+    def test_group_nodes_keeps_empty_groups(self):
+        batch = split_batch_delimiter(
+            TextNodeBatch.from_texts(["a **b**", "****"]), "**", TextType.BOLD
+        )
+        self.assertEqual(
+            batch.group_nodes(),
+            [[TextNode("a ", TextType.TEXT), TextNode("b", TextType.BOLD)], []],
+        )
+
+
+class TestBatchMatchesListSplitters(unittest.TestCase):
+
+    def assert_same(self, batch_split, list_split):
+        batch = batch_split(TextNodeBatch.from_texts(PARAGRAPHS))
+        expected = [list_split([TextNode(text, TextType.TEXT)]) for text in PARAGRAPHS]
+        self.assertEqual(batch.group_nodes(), expected)
+
+    def test_split_delimiter(self):
+        self.assert_same(
+            lambda batch: split_batch_delimiter(batch, "`", TextType.CODE),
+            lambda nodes: split_nodes_delimiter(nodes, "`", TextType.CODE),
+        )
+
+    def test_split_image(self):
+        self.assert_same(split_batch_image, split_nodes_image)
+
+    def test_split_link(self):
+        self.assert_same(split_batch_link, split_nodes_link)
+
+    def test_texts_to_batch(self):
+        batch = texts_to_batch(PARAGRAPHS)
+        self.assertEqual(
+            batch.group_nodes(), [text_to_textnodes(text) for text in PARAGRAPHS]
+        )
+
+    def test_unmatched_delimiter_raises_error(self):
+        batch = TextNodeBatch.from_texts(["fine", "This is `broken"])
+        with self.assertRaises(ValueError):
+            split_batch_delimiter(batch, "`", TextType.CODE)
+
+    def test_non_text_nodes_passed_through(self):
+        batch = split_batch_delimiter(
+            TextNodeBatch.from_texts(["`a` b"]), "`", TextType.CODE
+        )
+        batch = split_batch_delimiter(batch, "a", TextType.BOLD)
+        self.assertEqual(
+            batch.to_nodes(),
+            [TextNode("a", TextType.CODE), TextNode(" b", TextType.TEXT)],
+        )
+
+
+class TestBatchRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.paragraphs = [text for text in PARAGRAPHS if text != ""]
+        self.batch = texts_to_batch(self.paragraphs)
+
+    def test_group_rows(self):
+        first, last = self.batch.group_rows(1)
+        self.assertEqual(
+            [self.batch[i] for i in range(first, last)],
+            text_to_textnodes(self.paragraphs[1]),
+        )
+        last_group = len(self.paragraphs) - 1
+        self.assertEqual(self.batch.group_rows(last_group)[1], len(self.batch))
+
+    def test_matches_node_tree(self):
+        markdown = "\n\n".join(self.paragraphs)
+        image_props = {"https://i.imgur.com/fJRm4Vk.jpeg": {"width": "10"}}
+        expected = RenderContext().render(
+            blocks_to_html_node(markdown_to_blocks(markdown), image_props)
+        )
+        html = render_batch(self.batch, 0, len(self.paragraphs), image_props)
+        self.assertEqual(html, expected)
+
+    def test_pages_are_group_ranges(self):
+        context = RenderContext()
+        for first, last in ((0, 2), (2, 3), (3, len(self.paragraphs))):
+            markdown = "\n\n".join(self.paragraphs[first:last])
+            blocks = markdown_to_blocks(markdown)
+            self.assertEqual(
+                render_batch(self.batch, first, last, context=context),
+                RenderContext().render(blocks_to_html_node(blocks)),
+            )
+            self.assertEqual(
+                batch_index_entry("a.html", self.batch, first, last),
+                index_entry("a.html", blocks),
+            )
+
+    def test_shares_the_tag_cache(self):
+        context = RenderContext()
+        batch = texts_to_batch(["[a](x) [b](x)"])
+        self.assertEqual(
+            render_batch(batch, 0, 1, context=context),
+            '<div><p><a href="x">a</a> <a href="x">b</a></p></div>',
+        )
+        self.assertEqual((context.props_hits, context.props_misses), (1, 1))
+
+    def test_empty_paragraph_raises(self):
+        batch = texts_to_batch(["fine", "****"])
+        with self.assertRaises(ValueError):
+            render_batch(batch, 0, 2)
+
+    def test_no_paragraphs_raises(self):
+        with self.assertRaises(ValueError):
+            render_batch(texts_to_batch([]), 0, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,300 @@
+from array import array
+from bisect import bisect_left
+
+from htmlnode import RenderContext
+from inline import extract_markdown_images, extract_markdown_links
+from textnode import TextNode, TextType
+
+TEXT_TYPES = list(TextType)
+TYPE_CODES = {text_type: code for code, text_type in enumerate(TEXT_TYPES)}
+_TEXT = TYPE_CODES[TextType.TEXT]
+_LINKS = TYPE_CODES[TextType.LINKS]
+_IMAGES = TYPE_CODES[TextType.IMAGES]
+
+# Opening and closing tags for the types that render as a plain wrapper.
+_TAGS = {
+    TYPE_CODES[TextType.TEXT]: ("", ""),
+    TYPE_CODES[TextType.BOLD]: ("<strong>", "</strong>"),
+    TYPE_CODES[TextType.ITALIC]: ("<em>", "</em>"),
+    TYPE_CODES[TextType.CODE]: ("<code>", "</code>"),
+}
+
+
+class TextNodeBatch:
+    # Every node of many paragraphs as parallel columns of offsets into one
+    # shared source string. Rows stay in paragraph (group) order, so each
+    # group's rows are contiguous and the groups column is sorted.
+    def __init__(self, source, group_count=0):
+        self.source = source
+        self.group_count = group_count
+        self.text_types = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.url_starts = array("q")
+        self.url_ends = array("q")
+        self.groups = array("q")
+        self.columns = (
+            self.text_types,
+            self.starts,
+            self.ends,
+            self.url_starts,
+            self.url_ends,
+            self.groups,
+        )
+        self._offsets = None
+
+    @classmethod
+    def from_texts(cls, texts):
+        batch = cls("".join(texts), len(texts))
+        position = 0
+        for group, text in enumerate(texts):
+            batch.append(_TEXT, position, position + len(text), group=group)
+            position += len(text)
+        return batch
+
+    def append(self, code, start, end, url_start=-1, url_end=-1, group=0):
+        self.text_types.append(code)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.url_starts.append(url_start)
+        self.url_ends.append(url_end)
+        self.groups.append(group)
+
+    def extend_rows(self, other, start, end):
+        # Copies a run of rows column by column, without a Python-level loop.
+        if start < end:
+            for column, other_column in zip(self.columns, other.columns):
+                column.extend(other_column[start:end])
+
+    def appenders(self):
+        # Bound append methods in column order, for the splitters' inner loops.
+        return tuple(column.append for column in self.columns)
+
+    def group_rows(self, group):
+        # Rows are only ever added, so the offsets are recomputed when the
+        # batch has grown since they were last built.
+        if self._offsets is None or self._offsets[-1] != len(self):
+            self._offsets = array(
+                "q", (bisect_left(self.groups, g) for g in range(self.group_count))
+            )
+            self._offsets.append(len(self))
+        return self._offsets[group], self._offsets[group + 1]
+
+    def text(self, i):
+        return self.source[self.starts[i] : self.ends[i]]
+
+    def text_type(self, i):
+        return TEXT_TYPES[self.text_types[i]]
+
+    def url(self, i):
+        if self.url_starts[i] < 0:
+            return None
+        return self.source[self.url_starts[i] : self.url_ends[i]]
+
+    def __len__(self):
+        return len(self.text_types)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("TextNodeBatch index out of range")
+        return TextNode(self.text(i), self.text_type(i), self.url(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_nodes(self):
+        return list(self)
+
+    def group_nodes(self):
+        grouped = [[] for _ in range(self.group_count)]
+        for i in range(len(self)):
+            grouped[self.groups[i]].append(self[i])
+        return grouped
+
+    def __repr__(self):
+        return f"TextNodeBatch({len(self)} nodes, {len(self.source)} chars)"
+
+
+def split_batch_delimiter(batch, delimiter, text_type):
+    if delimiter == "":
+        raise ValueError("empty separator")
+
+    source = batch.source
+    code = TYPE_CODES[text_type]
+    new_batch = TextNodeBatch(source, batch.group_count)
+    add_type, add_start, add_end, add_url_start, add_url_end, add_group = (
+        new_batch.appenders()
+    )
+    copied = 0
+    rows = zip(batch.text_types, batch.starts, batch.ends, batch.groups)
+    for i, (row_type, start, end, group) in enumerate(rows):
+        if row_type != _TEXT:
+            continue
+        position = source.find(delimiter, start, end)
+        if position == -1:
+            continue
+
+        cuts = []
+        while position != -1:
+            cuts.append(position)
+            position = source.find(delimiter, position + len(delimiter), end)
+        if len(cuts) % 2 == 1:
+            raise ValueError(f"Invalid markdown, unmatched delimiter: '{delimiter}')")
+
+        new_batch.extend_rows(batch, copied, i)
+        copied = i + 1
+        part_start = start
+        for n, cut in enumerate(cuts + [end]):
+            if cut > part_start:
+                add_type(_TEXT if n % 2 == 0 else code)
+                add_start(part_start)
+                add_end(cut)
+                add_url_start(-1)
+                add_url_end(-1)
+                add_group(group)
+            part_start = cut + len(delimiter)
+
+    new_batch.extend_rows(batch, copied, len(batch))
+    return new_batch
+
+
+def _split_batch_markup(batch, extract, prefix_length, text_type, kind):
+    source = batch.source
+    code = TYPE_CODES[text_type]
+    new_batch = TextNodeBatch(source, batch.group_count)
+    add_type, add_start, add_end, add_url_start, add_url_end, add_group = (
+        new_batch.appenders()
+    )
+    copied = 0
+    rows = zip(batch.text_types, batch.starts, batch.ends, batch.groups)
+    for i, (row_type, start, end, group) in enumerate(rows):
+        # Every image and link contains "](", so most rows are ruled out
+        # without slicing the source.
+        if row_type != _TEXT or source.find("](", start, end) == -1:
+            continue
+        matches = extract(source[start:end])
+        if len(matches) == 0:
+            continue
+
+        new_batch.extend_rows(batch, copied, i)
+        copied = i + 1
+        cursor = start
+        for alt, url in matches:
+            markup = "!" * (prefix_length - 1) + f"[{alt}]({url})"
+            position = source.find(markup, cursor, end)
+            if position == -1:
+                raise ValueError(f"invalid markdown, {kind} section not closed")
+            if position > cursor:
+                add_type(_TEXT)
+                add_start(cursor)
+                add_end(position)
+                add_url_start(-1)
+                add_url_end(-1)
+                add_group(group)
+            alt_start = position + prefix_length
+            url_start = alt_start + len(alt) + 2
+            add_type(code)
+            add_start(alt_start)
+            add_end(alt_start + len(alt))
+            add_url_start(url_start)
+            add_url_end(url_start + len(url))
+            add_group(group)
+            cursor = position + len(markup)
+        if cursor < end:
+            add_type(_TEXT)
+            add_start(cursor)
+            add_end(end)
+            add_url_start(-1)
+            add_url_end(-1)
+            add_group(group)
+
+    new_batch.extend_rows(batch, copied, len(batch))
+    return new_batch
+
+
+def split_batch_image(batch):
+    return _split_batch_markup(
+        batch, extract_markdown_images, 2, TextType.IMAGES, "image"
+    )
+
+
+def split_batch_link(batch):
+    return _split_batch_markup(batch, extract_markdown_links, 1, TextType.LINKS, "link")
+
+
+def texts_to_batch(texts):
+    batch = TextNodeBatch.from_texts(texts)
+    batch = split_batch_delimiter(batch, "`", TextType.CODE)
+    batch = split_batch_image(batch)
+    batch = split_batch_link(batch)
+    batch = split_batch_delimiter(batch, "**", TextType.BOLD)
+    batch = split_batch_delimiter(batch, "_", TextType.ITALIC)
+    return batch
+
+
+def write_batch_html(batch, first_group, last_group, context, image_props=None):
+    # Writes groups [first_group, last_group) as the same <div> of <p>s that
+    # blocks_to_html_node builds, straight from the columns.
+    if first_group == last_group:
+        raise ValueError("Page must have at least one paragraph")
+
+    source = batch.source
+    write = context.buffer.write
+    write("<div>")
+    for group in range(first_group, last_group):
+        first, last = batch.group_rows(group)
+        if first == last:
+            raise ValueError("ParentNode must have children")
+
+        write("<p>")
+        for i in range(first, last):
+            code = batch.text_types[i]
+            text = source[batch.starts[i] : batch.ends[i]]
+            if code == _LINKS:
+                url = source[batch.url_starts[i] : batch.url_ends[i]]
+                write(context.props_tag("a", {"href": url}))
+                write(text)
+                write("</a>")
+            elif code == _IMAGES:
+                url = source[batch.url_starts[i] : batch.url_ends[i]]
+                props = {"src": url, "alt": text}
+                if image_props is not None and image_props.get(url) is not None:
+                    props.update(image_props[url])
+                write(context.props_tag("img", props))
+                write("</img>")
+            else:
+                open_tag, close_tag = _TAGS[code]
+                write(open_tag)
+                write(text)
+                write(close_tag)
+        write("</p>")
+    write("</div>")
+
+
+def render_batch(batch, first_group, last_group, image_props=None, context=None):
+    if context is None:
+        context = RenderContext()
+    context.clear()
+    write_batch_html(batch, first_group, last_group, context, image_props)
+    return context.buffer.getvalue()
+
+
+def batch_index_entry(path, batch, first_group, last_group):
+    # The same entry index_entry builds from TextNode blocks.
+    source = batch.source
+    links = []
+    texts = []
+    for group in range(first_group, last_group):
+        first, last = batch.group_rows(group)
+        parts = []
+        for i in range(first, last):
+            code = batch.text_types[i]
+            if code == _LINKS:
+                links.append(source[batch.url_starts[i] : batch.url_ends[i]])
+            if code != _IMAGES:
+                parts.append(source[batch.starts[i] : batch.ends[i]])
+        texts.append("".join(parts))
+    return {"path": path, "links": links, "text": " ".join(texts)}
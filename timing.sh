@@ -0,0 +1,5 @@
+# Wall-clock checks that are too noisy for test.sh: run them as their own
+# CI step, on an otherwise idle machine.
+set -e
+STARTUP_TIMING=1 python3 -m unittest discover -s src -p "test_startup.py"
+FUZZ_TIMING=1 python3 -m unittest discover -s src -p "test_fuzz.py"